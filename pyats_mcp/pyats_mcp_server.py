@@ -11,22 +11,25 @@ from __future__ import annotations
 
 import os
 import sys
-import json
 import logging
 import asyncio
+import threading
 from functools import partial
 from typing import Any
 
+import orjson
 from fastmcp import FastMCP
 
 # Import all resources from pyats_resources module
 from .pyats_resources import (
     # Core functions
-    _load_testbed,
+    _get_devices_meta,
+    _warm_parser_cache,
     reject_unsafe_script,
     _run_test_script,
     # Async operations
     run_show_command_async,
+    run_show_commands_async,
     apply_device_configuration_async,
     execute_learn_config_async,
     execute_learn_logging_async,
@@ -49,6 +52,16 @@ logger = logging.getLogger("PyatsFastMCPServer")
 # -----------------------------------------------------------------------------
 mcp = FastMCP("pyATS Network Automation Server")
 
+# Tool results are compact JSON unless MCP_PRETTY_JSON=1 asks for indentation
+_JSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+if os.getenv("MCP_PRETTY_JSON", "0") == "1":
+    _JSON_OPTIONS |= orjson.OPT_INDENT_2
+
+
+def _dump(obj: Any) -> str:
+    """Serialize a tool result to JSON text."""
+    return orjson.dumps(obj, option=_JSON_OPTIONS).decode()
+
 
 # -----------------------------------------------------------------------------
 # MCP Tools
@@ -58,19 +71,10 @@ mcp = FastMCP("pyATS Network Automation Server")
 async def pyats_list_devices(toolCallId: str = None) -> str:
     """List all devices available in the testbed with their properties."""
     try:
-        tb = _load_testbed()
-        devices: dict[str, Any] = {}
-        for name, dev in tb.devices.items():
-            devices[name] = {
-                "os": getattr(dev, "os", None),
-                "type": getattr(dev, "type", None),
-                "platform": getattr(dev, "platform", None),
-                "connections": list(getattr(dev, "connections", {}).keys()),
-            }
-        return json.dumps({"status": "completed", "devices": devices}, indent=2)
+        return _dump({"status": "completed", "devices": _get_devices_meta()})
     except Exception as e:
         logger.error(f"Error in pyats_list_devices: {e}", exc_info=True)
-        return json.dumps({"status": "error", "error": str(e)}, indent=2)
+        return _dump({"status": "error", "error": str(e)})
 
 
 @mcp.tool()
@@ -82,10 +86,26 @@ async def pyats_run_show_command(device_name: str, command: str, toolCallId: str
     """
     try:
         result = await run_show_command_async(device_name, command)
-        return json.dumps(result, indent=2)
+        return _dump(result)
     except Exception as e:
         logger.error(f"Error in pyats_run_show_command: {e}", exc_info=True)
-        return json.dumps({"status": "error", "error": str(e)}, indent=2)
+        return _dump({"status": "error", "error": str(e)})
+
+
+@mcp.tool()
+async def pyats_run_show_commands(device_name: str, commands: list[str], toolCallId: str = None) -> str:
+    """
+    Execute several show commands on a device over one session and return parsed output
+    (or raw if parsing fails) for each command, in order.
+    Prefer this over repeated pyats_run_show_command calls against the same device.
+    The same rules as pyats_run_show_command apply to every command.
+    """
+    try:
+        result = await run_show_commands_async(device_name, commands)
+        return _dump(result)
+    except Exception as e:
+        logger.error(f"Error in pyats_run_show_commands: {e}", exc_info=True)
+        return _dump({"status": "error", "error": str(e)})
 
 
 @mcp.tool()
@@ -112,10 +132,10 @@ async def pyats_configure_device(device_name: str, config_commands: Any, toolCal
     """
     try:
         result = await apply_device_configuration_async(device_name, config_commands)
-        return json.dumps(result, indent=2)
+        return _dump(result)
     except Exception as e:
         logger.error(f"Error in pyats_configure_device: {e}", exc_info=True)
-        return json.dumps({"status": "error", "error": str(e)}, indent=2)
+        return _dump({"status": "error", "error": str(e)})
 
 
 @mcp.tool()
@@ -123,10 +143,10 @@ async def pyats_show_running_config(device_name: str, toolCallId: str = None) ->
     """Get the complete running configuration from a device (raw output)."""
     try:
         result = await execute_learn_config_async(device_name)
-        return json.dumps(result, indent=2)
+        return _dump(result)
     except Exception as e:
         logger.error(f"Error in pyats_show_running_config: {e}", exc_info=True)
-        return json.dumps({"status": "error", "error": str(e)}, indent=2)
+        return _dump({"status": "error", "error": str(e)})
 
 
 @mcp.tool()
@@ -134,10 +154,10 @@ async def pyats_show_logging(device_name: str, toolCallId: str = None) -> str:
     """Get device logs using 'show logging' (raw output)."""
     try:
         result = await execute_learn_logging_async(device_name)
-        return json.dumps(result, indent=2)
+        return _dump(result)
     except Exception as e:
         logger.error(f"Error in pyats_show_logging: {e}", exc_info=True)
-        return json.dumps({"status": "error", "error": str(e)}, indent=2)
+        return _dump({"status": "error", "error": str(e)})
 
 
 @mcp.tool()
@@ -149,10 +169,10 @@ async def pyats_ping_from_network_device(device_name: str, command: str, toolCal
     """
     try:
         result = await run_ping_command_async(device_name, command)
-        return json.dumps(result, indent=2)
+        return _dump(result)
     except Exception as e:
         logger.error(f"Error in pyats_ping_from_network_device: {e}", exc_info=True)
-        return json.dumps({"status": "error", "error": str(e)}, indent=2)
+        return _dump({"status": "error", "error": str(e)})
 
 
 @mcp.tool()
@@ -160,10 +180,10 @@ async def pyats_run_linux_command(device_name: str, command: str, toolCallId: st
     """Execute a Linux command on a device (for Linux-based network devices)."""
     try:
         result = await run_linux_command_async(device_name, command)
-        return json.dumps(result, indent=2)
+        return _dump(result)
     except Exception as e:
         logger.error(f"Error in pyats_run_linux_command: {e}", exc_info=True)
-        return json.dumps({"status": "error", "error": str(e)}, indent=2)
+        return _dump({"status": "error", "error": str(e)})
 
 
 @mcp.tool()
@@ -180,27 +200,40 @@ async def pyats_run_dynamic_test(test_script_content: str, toolCallId: str = Non
     Returns: Full job report with PASS/FAIL result and detailed test outcomes
     """
     if not (test_script_content or "").strip():
-        return json.dumps({"status": "error", "error": "Empty test script content provided."}, indent=2)
+        return _dump({"status": "error", "error": "Empty test script content provided."})
 
     reason = reject_unsafe_script(test_script_content)
     if reason:
-        return json.dumps({"status": "error", "error": reason}, indent=2)
+        return _dump({"status": "error", "error": reason})
 
     try:
         loop = asyncio.get_running_loop()
         result = await loop.run_in_executor(None, partial(_run_test_script, test_script_content, 300))
-        return json.dumps(result, indent=2)
+        return _dump(result)
     except Exception as e:
         logger.error(f"Error in pyats_run_dynamic_test: {e}", exc_info=True)
-        return json.dumps({"status": "error", "error": str(e)}, indent=2)
+        return _dump({"status": "error", "error": str(e)})
 
 
 # =============================================================================
 # SERVER STARTUP
 # =============================================================================
+def _install_uvloop() -> None:
+    """Use uvloop as the asyncio event loop when available (not on Windows)."""
+    try:
+        import uvloop
+    except ImportError:
+        logger.info("uvloop not available; using the default asyncio event loop")
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info("✅ Using uvloop event loop")
+
+
 def main():
     """Main entry point for the MCP server."""
     logger.info('🤖 pyATS MCP Server starting!')
+    _install_uvloop()
+    threading.Thread(target=_warm_parser_cache, name="parser-warmup", daemon=True).start()
 
     transport = os.getenv("MCP_TRANSPORT", "stdio").lower()
     if transport == "http" or transport == "sse":
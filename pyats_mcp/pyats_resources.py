@@ -16,18 +16,25 @@ from __future__ import annotations
 import os
 import re
 import sys
-import json
 import time
 import string
 import logging
-import textwrap
 import asyncio
+import atexit
+import signal
+import threading
 import subprocess
 import shutil
+import multiprocessing
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from pathlib import Path
 from functools import partial
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Optional, List, Tuple, Union
 
+import orjson
 from dotenv import load_dotenv
 from pyats.topology import loader
 from genie.libs.parser.utils import get_parser
@@ -54,57 +61,229 @@ ARTIFACTS_DIR = Path(os.getenv("PYATS_MCP_ARTIFACTS_DIR", str(Path.home() / ".py
 KEEP_ARTIFACTS = os.getenv("PYATS_MCP_KEEP_ARTIFACTS", "1") == "1"
 ARTIFACTS_DIR.mkdir(parents=True, exist_ok=True)
 
-# Caching configuration
-_CACHE_TTL_S = int(os.getenv("PYATS_MCP_TESTBED_CACHE_TTL", "30"))
-_TESTBED_CACHE: Dict[str, Any] = {"loaded_at": 0.0, "tb": None}
+# Dynamic tests run in single-use worker processes started ahead of time with
+# pyATS preloaded, at most _JOB_WORKERS at once; PYATS_MCP_INPROC=0 spawns a
+# 'pyats run job' subprocess per test instead
+_INPROC_JOBS = os.getenv("PYATS_MCP_INPROC", "1") == "1"
+_JOB_WORKERS = int(os.getenv("PYATS_MCP_JOB_WORKERS", "2"))
+_JOB_WORKER_START_TIMEOUT_S = 120
+_JOB_SLOTS = threading.BoundedSemaphore(_JOB_WORKERS)
+_JOB_SPARES: List["_JobWorker"] = []
+_JOB_POOL_LOCK = threading.Lock()
+_JOB_ATEXIT_REGISTERED = False
+
+# Only the tail of a job's output is returned; the full log stays in run_dir
+_STDOUT_TAIL_BYTES = 64 * 1024
+
+# Discarded run directories are removed by a background thread unless
+# PYATS_MCP_SYNC_CLEANUP=1 asks for removal before the tool returns
+_SYNC_CLEANUP = os.getenv("PYATS_MCP_SYNC_CLEANUP", "0") == "1"
+_CLEANUP_QUEUE: "queue.Queue[Path]" = queue.Queue()
+
+# Caching configuration: the testbed is reloaded only when the file changes
+_TESTBED_CACHE: Dict[str, Any] = {"mtime": None, "tb": None, "devices_meta": {}}
+
+# Genie parser lookups keyed by (device tokens, command), None when there is no
+# parser; cleared on testbed reload
+_PARSER_CACHE_SIZE = 2048
+_PARSER_CACHE: Dict[tuple, Any] = {}
+
+# Connection pooling: idle TTL, hard max age and the idle period after which a
+# pooled session is probed before being reused (Unicon has no SSH keepalive knob)
+_CONN_CACHE_TTL_S = int(os.getenv("PYATS_MCP_CONN_CACHE_TTL", "300"))
+_CONN_MAX_AGE_S = int(os.getenv("PYATS_MCP_CONN_MAX_AGE", "3600"))
+_CONN_KEEPALIVE_S = int(os.getenv("PYATS_MCP_CONN_KEEPALIVE", "30"))
+
+
+@dataclass
+class _Slot:
+    """
+    Pooled connection for one device, guarded by its own lock.
+
+    The lock is held from checkout in _get_device() until the device is
+    returned with _disconnect_device(), so a slot in use is never evicted.
+    """
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    device: Any = None
+    checked_out: Any = None
+
 
-_CONN_CACHE_TTL_S = int(os.getenv("PYATS_MCP_CONN_CACHE_TTL", "0"))
-_CONN_CACHE: Dict[str, Dict[str, Any]] = {}
+# Slots are created once per device and never removed, so a slot lock is stable
+_CONN_CACHE: Dict[str, _Slot] = {}
+_CONN_CACHE_LOCK = threading.Lock()
+
+# Timestamps of connected slots live outside the slots, in two maps kept in
+# expiry order (least recently used first / oldest first), so an eviction
+# sweep stops at the first entry that has not expired. Timestamps come from
+# time.monotonic() so that order holds across wall clock changes. Guarded by
+# _CONN_CACHE_LOCK.
+_POOL_LAST_USED: "OrderedDict[str, float]" = OrderedDict()
+_POOL_CREATED: "OrderedDict[str, float]" = OrderedDict()
+
+# Dedicated worker pool for blocking Unicon I/O, sized independently of the
+# default executor; one asyncio lock per device serializes its CLI channel
+_DEVICE_WORKERS = int(os.getenv("PYATS_MCP_DEVICE_WORKERS", "64"))
+_DEVICE_EXECUTOR = ThreadPoolExecutor(max_workers=_DEVICE_WORKERS, thread_name_prefix="pyats-device")
+_DEVICE_LOCKS: Dict[str, asyncio.Lock] = {}
 
 # -----------------------------------------------------------------------------
 # Output Cleaning
 # -----------------------------------------------------------------------------
 ANSI_ESCAPE = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
 
+# string.printable is pure ASCII: dropping non-ASCII on encode and deleting the
+# remaining non-printable bytes filters the output in C instead of per char
+_NON_PRINTABLE_BYTES = bytes(b for b in range(128) if chr(b) not in string.printable)
+
 
 def clean_output(output: str) -> str:
     """Remove ANSI escape codes and non-printable characters from output."""
     output = ANSI_ESCAPE.sub("", output)
-    return "".join(ch for ch in output if ch in string.printable)
+    return output.encode("ascii", "ignore").translate(None, _NON_PRINTABLE_BYTES).decode("ascii")
 
 
 # -----------------------------------------------------------------------------
 # Testbed and Device Management
 # -----------------------------------------------------------------------------
 def _load_testbed():
-    """Load testbed with TTL-based caching."""
-    now = time.time()
-    if _TESTBED_CACHE["tb"] is None or (now - _TESTBED_CACHE["loaded_at"]) > _CACHE_TTL_S:
-        _TESTBED_CACHE["tb"] = loader.load(TESTBED_PATH)
-        _TESTBED_CACHE["loaded_at"] = now
+    """Load testbed, reloading only when the file modification time changes."""
+    try:
+        mtime = os.stat(TESTBED_PATH).st_mtime_ns
+    except OSError as e:
+        # The file may be mid-replace by an editor or deploy; keep the cached testbed
+        if _TESTBED_CACHE["tb"] is None:
+            raise
+        logger.warning(f"Cannot stat testbed file {TESTBED_PATH} ({e}); using the cached testbed")
+        return _TESTBED_CACHE["tb"]
+    if _TESTBED_CACHE["tb"] is None or mtime != _TESTBED_CACHE["mtime"]:
+        tb = loader.load(TESTBED_PATH)
+        _TESTBED_CACHE["tb"] = tb
+        _TESTBED_CACHE["mtime"] = mtime
+        _TESTBED_CACHE["devices_meta"] = {
+            name: {
+                "os": getattr(dev, "os", None),
+                "type": getattr(dev, "type", None),
+                "platform": getattr(dev, "platform", None),
+                "connections": list(getattr(dev, "connections", {}).keys()),
+            }
+            for name, dev in tb.devices.items()
+        }
+        _PARSER_CACHE.clear()
     return _TESTBED_CACHE["tb"]
 
 
+def _get_devices_meta() -> Dict[str, Dict[str, Any]]:
+    """Get device metadata (os, type, platform, connections) built at testbed load."""
+    _load_testbed()
+    return _TESTBED_CACHE["devices_meta"]
+
+
+def _close_quietly(name: str, dev) -> None:
+    """Disconnect a pooled device, ignoring any error."""
+    try:
+        if dev and getattr(dev, "is_connected", lambda: False)():
+            dev.disconnect()
+    except Exception as e:
+        logger.debug(f"Ignoring error while disconnecting {name}: {e}")
+
+
+def _is_alive(dev) -> bool:
+    """Check a pooled connection with a cheap prompt round-trip."""
+    try:
+        if not dev.is_connected():
+            return False
+        dev.execute("", timeout=10)
+        return True
+    except Exception:
+        return False
+
+
+def _touch(device_name: str, now: float, created: bool = False) -> None:
+    """Record use of a pooled connection (and its creation when it was just opened)."""
+    with _CONN_CACHE_LOCK:
+        _POOL_LAST_USED[device_name] = now
+        _POOL_LAST_USED.move_to_end(device_name)
+        if created:
+            _POOL_CREATED.pop(device_name, None)
+            _POOL_CREATED[device_name] = now
+
+
+def _forget(device_name: str) -> None:
+    """Drop the timestamps of a connection leaving the pool."""
+    with _CONN_CACHE_LOCK:
+        _POOL_LAST_USED.pop(device_name, None)
+        _POOL_CREATED.pop(device_name, None)
+
+
+def _is_expired(device_name: str, now: float) -> bool:
+    """Check a pooled connection against the idle TTL and the max age."""
+    if (now - _POOL_LAST_USED.get(device_name, float("-inf"))) > _CONN_CACHE_TTL_S:
+        return True
+    return _CONN_MAX_AGE_S > 0 and (now - _POOL_CREATED.get(device_name, float("-inf"))) > _CONN_MAX_AGE_S
+
+
+def _get_slot(device_name: str) -> _Slot:
+    """Return the pool slot for a device, creating it on first use."""
+    with _CONN_CACHE_LOCK:
+        slot = _CONN_CACHE.get(device_name)
+        if slot is None:
+            slot = _CONN_CACHE[device_name] = _Slot()
+        return slot
+
+
 def _evict_expired_connections() -> None:
-    """Remove expired connections from cache based on TTL."""
+    """Remove connections idle longer than the TTL or older than the max age."""
     if _CONN_CACHE_TTL_S <= 0:
         return
-    now = time.time()
-    expired = [k for k, v in _CONN_CACHE.items() if (now - float(v.get("last_used", 0))) > _CONN_CACHE_TTL_S]
-    for name in expired:
-        dev = _CONN_CACHE.get(name, {}).get("device")
+    now = time.monotonic()
+    expired: List[str] = []
+    with _CONN_CACHE_LOCK:
+        for name, last_used in _POOL_LAST_USED.items():
+            if (now - last_used) <= _CONN_CACHE_TTL_S:
+                break
+            expired.append(name)
+        if _CONN_MAX_AGE_S > 0:
+            for name, created_at in _POOL_CREATED.items():
+                if (now - created_at) <= _CONN_MAX_AGE_S:
+                    break
+                expired.append(name)
+
+    for name in dict.fromkeys(expired):
+        slot = _CONN_CACHE.get(name)
+        # A busy slot is in use right now, so it is not idle; skip it
+        if slot is None or not slot.lock.acquire(blocking=False):
+            continue
         try:
-            if dev and getattr(dev, "is_connected", lambda: False)():
-                logger.info(f"Conn cache TTL expired; disconnecting {name}...")
-                dev.disconnect()
-        except Exception:
-            pass
-        _CONN_CACHE.pop(name, None)
+            if slot.device is not None and _is_expired(name, now):
+                logger.info(f"Conn cache entry expired; disconnecting {name}...")
+                _close_quietly(name, slot.device)
+                slot.device = None
+                _forget(name)
+        finally:
+            slot.lock.release()
+
+
+def _connect(device_name: str, device) -> None:
+    """Connect a testbed device if it is not connected yet."""
+    if not device.is_connected():
+        logger.info(f"Connecting to {device_name}...")
+        device.connect(
+            connection_timeout=120,
+            learn_hostname=True,
+            log_stdout=False,
+            mit=True,
+        )
+        logger.info(f"Connected to {device_name}")
 
 
 def _get_device(device_name: str):
     """
     Get a device from testbed, managing connections and caching.
+
+    Pooled connections idle for longer than the keepalive interval are probed
+    before reuse; dead ones are dropped and transparently reconnected. A
+    pooled device is checked out: its slot lock stays held until it is given
+    back with _disconnect_device(), which callers must always do.
     
     Args:
         device_name: Name of the device in the testbed
@@ -120,33 +299,50 @@ def _get_device(device_name: str):
     if not device:
         raise ValueError(f"Device '{device_name}' not found in testbed '{TESTBED_PATH}'.")
 
-    if _CONN_CACHE_TTL_S > 0:
-        _evict_expired_connections()
-        if device_name in _CONN_CACHE:
-            cached = _CONN_CACHE[device_name].get("device")
-            if cached and getattr(cached, "is_connected", lambda: False)():
-                _CONN_CACHE[device_name]["last_used"] = time.time()
+    if _CONN_CACHE_TTL_S <= 0:
+        _connect(device_name, device)
+        return device
+
+    # Key the pool by the device's own name so _disconnect_device finds it
+    # even when the caller used a testbed alias
+    name = getattr(device, "name", device_name)
+    _evict_expired_connections()
+    slot = _get_slot(name)
+    slot.lock.acquire()
+    try:
+        cached = slot.device
+        if cached is not None:
+            now = time.monotonic()
+            if (now - _POOL_LAST_USED.get(name, float("-inf"))) <= _CONN_KEEPALIVE_S:
+                alive = cached.is_connected()
+            else:
+                alive = _is_alive(cached)
+            if alive:
+                _touch(name, now)
+                slot.checked_out = cached
                 return cached
+            logger.info(f"Pooled connection to {name} is stale; reconnecting...")
+            slot.device = None
+            _forget(name)
+            _close_quietly(name, cached)
 
-    if not device.is_connected():
-        logger.info(f"Connecting to {device_name}...")
-        device.connect(
-            connection_timeout=120,
-            learn_hostname=True,
-            log_stdout=False,
-            mit=True,
-        )
-        logger.info(f"Connected to {device_name}")
-
-    if _CONN_CACHE_TTL_S > 0:
-        _CONN_CACHE[device_name] = {"device": device, "last_used": time.time()}
-
-    return device
+        _connect(name, device)
+        slot.device = device
+        _touch(name, time.monotonic(), created=True)
+        slot.checked_out = device
+        return device
+    except BaseException:
+        slot.lock.release()
+        raise
 
 
 def _disconnect_device(device, force: bool = False):
     """
     Disconnect from device, respecting cache TTL unless forced.
+
+    A pooled device is returned to the pool and its slot lock released.
+    Forcing also drops the device from the connection pool, so a session left
+    in an unknown state (failed command, stuck in config mode) is not reused.
     
     Args:
         device: Device object to disconnect
@@ -155,12 +351,21 @@ def _disconnect_device(device, force: bool = False):
     if not device:
         return
 
-    if _CONN_CACHE_TTL_S > 0 and not force:
-        try:
-            _CONN_CACHE[getattr(device, "name", "unknown")]["last_used"] = time.time()
-        except Exception:
-            pass
-        return
+    if _CONN_CACHE_TTL_S > 0:
+        name = getattr(device, "name", "unknown")
+        slot = _CONN_CACHE.get(name)
+        if slot is not None and slot.checked_out is device:
+            slot.checked_out = None
+            try:
+                if not force:
+                    _touch(name, time.monotonic())
+                    return
+                slot.device = None
+                _forget(name)
+            finally:
+                slot.lock.release()
+        elif not force:
+            return
 
     if getattr(device, "is_connected", lambda: False)():
         try:
@@ -171,6 +376,69 @@ def _disconnect_device(device, force: bool = False):
             logger.warning(f"Error disconnecting: {e}")
 
 
+# -----------------------------------------------------------------------------
+# Parser Lookup
+# -----------------------------------------------------------------------------
+# Device attributes Genie uses to pick a parser (the parsers.json "tokens")
+_PARSER_TOKENS = ("os", "platform", "model", "submodel", "pid", "revision")
+
+
+def _parser_tokens(device) -> tuple:
+    """Return the device attributes that select its Genie parsers."""
+    return tuple(getattr(device, attr, None) for attr in _PARSER_TOKENS)
+
+
+def _get_parser_cached(command: str, device):
+    """
+    Look up the Genie parser for a command, memoized per device tokens.
+
+    Parser selection only depends on the device tokens and the command, so
+    the registry walk in get_parser() is done once per combination. A failed
+    lookup (e.g. ParserNotFound) is cached as None, meaning no parser.
+    """
+    key = (_parser_tokens(device), " ".join(command.split()))
+    try:
+        return _PARSER_CACHE[key]
+    except KeyError:
+        pass
+    try:
+        parser = get_parser(command, device)
+    except Exception as e:
+        logger.debug(f"No parser for '{command}': {e}")
+        parser = None
+    if len(_PARSER_CACHE) >= _PARSER_CACHE_SIZE:
+        _PARSER_CACHE.clear()
+    _PARSER_CACHE[key] = parser
+    return parser
+
+
+_PARSER_WARMUP_COMMANDS = ("show version", "show interfaces")
+
+
+def _warm_parser_cache() -> None:
+    """
+    Resolve parsers for common commands once per set of device tokens.
+
+    Meant to run in a background thread at startup, so the Genie parser
+    imports done by the first get_parser() call are off the request path.
+    """
+    try:
+        tb = _load_testbed()
+    except Exception as e:
+        logger.warning(f"Parser warmup skipped, testbed failed to load: {e}")
+        return
+
+    seen = set()
+    for device in tb.devices.values():
+        tokens = _parser_tokens(device)
+        if not tokens[0] or tokens in seen:
+            continue
+        seen.add(tokens)
+        for command in _PARSER_WARMUP_COMMANDS:
+            _get_parser_cached(command, device)
+    logger.info(f"Parser cache warmed for {len(seen)} device type(s)")
+
+
 # -----------------------------------------------------------------------------
 # Show Command Validation
 # -----------------------------------------------------------------------------
@@ -178,6 +446,20 @@ SHOW_BLOCK_CHARS = ["|", ">", "<"]
 SHOW_BLOCK_WORDS = {"copy", "delete", "erase", "reload", "write", "configure", "conf"}
 
 
+# One pass accepting "show..." with no pipe/redirection characters and no
+# blocked word as a standalone [A-Za-z0-9_-] token. re.ASCII keeps case-insensitive
+# matching from folding non-ASCII letters (e.g. dotless i, Kelvin sign) into the
+# token class, which would glue them onto a blocked word
+_SHOW_TOKEN = r"[A-Za-z0-9_-]"
+_SHOW_FREE = "[^" + re.escape("".join(SHOW_BLOCK_CHARS)) + "]"
+_SHOW_CMD_RE = re.compile(
+    rf"\s*show"
+    rf"(?!{_SHOW_FREE}*?(?<!{_SHOW_TOKEN})(?:{'|'.join(sorted(SHOW_BLOCK_WORDS))})(?!{_SHOW_TOKEN}))"
+    rf"{_SHOW_FREE}*",
+    re.IGNORECASE | re.ASCII,
+)
+
+
 def validate_show_command(command: str) -> Optional[str]:
     """
     Validate that a command is a safe show command.
@@ -188,6 +470,10 @@ def validate_show_command(command: str) -> Optional[str]:
     Returns:
         Error message if invalid, None if valid
     """
+    if _SHOW_CMD_RE.fullmatch(command or ""):
+        return None
+
+    # Rejected: work out which rule failed for the error message
     cmd = (command or "").strip()
     cmd_lower = cmd.lower()
 
@@ -202,7 +488,15 @@ def validate_show_command(command: str) -> Optional[str]:
         if t in SHOW_BLOCK_WORDS:
             return f"Command '{command}' contains disallowed term '{t}'."
 
-    return None
+    return f"Command '{command}' is not a valid 'show' command."
+
+
+# Regression checks: non-ASCII letters next to a blocked word must not hide it
+assert validate_show_command("show run\n\u0131reload")
+assert validate_show_command("show   \u0131write")
+assert validate_show_command("show \u212acopy")
+assert validate_show_command("show \u017fdelete")
+assert validate_show_command("show version") is None
 
 
 # -----------------------------------------------------------------------------
@@ -215,6 +509,8 @@ _WRAPPER_LINES = {
     "configure t",
     "end",
 }
+_WRAPPER_SET = frozenset(map(str.casefold, _WRAPPER_LINES))
+_SEMI = re.compile(r"\s*;\s*")
 
 
 def _normalize_config_lines(config_commands: Union[str, List[Any], None]) -> List[str]:
@@ -240,33 +536,23 @@ def _normalize_config_lines(config_commands: Union[str, List[Any], None]) -> Lis
     # Build initial lines
     if isinstance(config_commands, list):
         raw_lines = [str(x) for x in config_commands]
+        indent = 0
     else:
-        # Handle multiline string
-        cleaned = textwrap.dedent(str(config_commands)).strip("\n")
-        raw_lines = cleaned.splitlines()
+        # Handle multiline string: dedent by the leading whitespace common to
+        # all non-blank lines (like textwrap.dedent) while slicing, without
+        # building a dedented copy
+        raw_lines = str(config_commands).splitlines()
+        margins = [l[:len(l) - len(l.lstrip())] for l in raw_lines if l.strip()]
+        indent = len(os.path.commonprefix(margins)) if margins else 0
 
     out: List[str] = []
     for line in raw_lines:
-        s = line.rstrip("\r\n")
-        if not s.strip():
-            continue
-
-        # Split semicolon-separated commands
-        if ";" in s:
-            parts = [p.strip() for p in s.split(";") if p.strip()]
-            for p in parts:
-                low = p.lower()
-                if low in _WRAPPER_LINES:
-                    continue
-                out.append(p)
-            continue
-
-        # Check if line is a wrapper command
-        low = s.strip().lower()
-        if low in _WRAPPER_LINES:
-            continue
-
-        out.append(s)
+        # Split semicolon-separated commands (a no-op without semicolons)
+        for part in _SEMI.split(line[indent:].rstrip("\r\n")):
+            key = part.strip().casefold()
+            if not key or key in _WRAPPER_SET:
+                continue
+            out.append(part)
 
     return out
 
@@ -274,6 +560,87 @@ def _normalize_config_lines(config_commands: Union[str, List[Any], None]) -> Lis
 # -----------------------------------------------------------------------------
 # Async Command Execution Functions
 # -----------------------------------------------------------------------------
+def _get_device_lock(device_name: str) -> Optional[asyncio.Lock]:
+    """
+    Return the asyncio lock of a testbed device, keyed like _CONN_CACHE.
+
+    Names that do not resolve in the testbed get no lock (their call fails
+    in _get_device()), so client input cannot grow _DEVICE_LOCKS.
+    """
+    try:
+        device = _load_testbed().devices.get(device_name)
+    except Exception:
+        return None
+    if not device:
+        return None
+    name = getattr(device, "name", device_name)
+    lock = _DEVICE_LOCKS.get(name)
+    if lock is None:
+        lock = _DEVICE_LOCKS[name] = asyncio.Lock()
+    return lock
+
+
+async def _run_on_device(device_name: str, func):
+    """
+    Run a blocking device operation on the device worker pool.
+
+    Calls for the same device wait on an asyncio lock instead of parking a
+    worker thread, so the pool only holds threads doing actual device I/O.
+    The lock is released when the worker finishes, not when the caller
+    stops waiting, so a cancelled call cannot overlap the next one.
+    """
+    loop = asyncio.get_running_loop()
+    lock = _get_device_lock(device_name)
+    if lock is None:
+        return await loop.run_in_executor(_DEVICE_EXECUTOR, func)
+    await lock.acquire()
+    try:
+        future = loop.run_in_executor(_DEVICE_EXECUTOR, func)
+    except BaseException:
+        lock.release()
+        raise
+    future.add_done_callback(lambda _: lock.release())
+    return await asyncio.shield(future)
+
+
+def _execute_show(device, device_name: str, command: str) -> Dict[str, Any]:
+    """Run a validated show command on a connected device and try to parse it."""
+    raw = device.execute(command, timeout=60)
+    return _parse_show_output(device, device_name, command, clean_output(raw))
+
+
+def _parse_show_output(device, device_name: str, command: str, cleaned: str) -> Dict[str, Any]:
+    """
+    Parse show command output with its Genie parser, if any.
+
+    Never raises: a missing parser or a parse error returns the raw output,
+    so only device I/O errors reach the callers' session handling.
+    """
+    parser_cls = _get_parser_cached(command, device)
+    if parser_cls:
+        try:
+            parser_obj = parser_cls(device=device)
+            parsed = parser_obj.parse(output=cleaned)
+            return {
+                "status": "completed",
+                "device": device_name,
+                "command": command,
+                "parsed_output": parsed,
+                "raw_output": cleaned,
+                "parser_used": parser_cls.__name__,
+            }
+        except Exception as e:
+            logger.warning(f"Parser failed: {e}")
+
+    return {
+        "status": "completed",
+        "device": device_name,
+        "command": command,
+        "raw_output": cleaned,
+        "parser_used": None,
+    }
+
+
 async def run_show_command_async(device_name: str, command: str) -> Dict[str, Any]:
     """
     Execute a show command asynchronously with parsing attempt.
@@ -293,41 +660,87 @@ async def run_show_command_async(device_name: str, command: str) -> Dict[str, An
         device = None
         try:
             device = _get_device(device_name)
-            raw = device.execute(command, timeout=60)
-            cleaned = clean_output(raw)
+            return _execute_show(device, device_name, command)
 
-            parser_cls = get_parser(command, device)
-            if parser_cls:
-                try:
-                    parser_obj = parser_cls(device=device)
-                    parsed = parser_obj.parse(output=cleaned)
-                    return {
-                        "status": "completed",
+        except Exception as e:
+            logger.error(f"Error running show command: {e}", exc_info=True)
+            # Drop the session: it may be mid-command
+            _disconnect_device(device, force=True)
+            device = None
+            return {"status": "error", "device": device_name, "command": command, "error": str(e)}
+        finally:
+            _disconnect_device(device)
+
+    return await _run_on_device(device_name, _run)
+
+
+async def run_show_commands_async(device_name: str, commands: List[str]) -> Dict[str, Any]:
+    """
+    Execute a batch of show commands on one device session asynchronously.
+
+    The device is checked out once and stays checked out for the whole
+    batch. Each command is validated and parsed on its own; an invalid
+    command does not stop the rest of the batch, but a command failing on
+    the device drops the session and skips the commands after it.
+    
+    Args:
+        device_name: Name of device in testbed
+        commands: Show commands to execute, in order
+        
+    Returns:
+        Dictionary with status and one result dictionary per command
+    """
+    def _run():
+        if not commands:
+            return {"status": "error", "device": device_name, "error": "No commands provided."}
+
+        errors = {i: validate_show_command(cmd) for i, cmd in enumerate(commands)}
+        if all(errors.values()):
+            results = [{"status": "error", "command": cmd, "error": errors[i]} for i, cmd in enumerate(commands)]
+            return {"status": "error", "device": device_name, "results": results}
+
+        device = None
+        try:
+            device = _get_device(device_name)
+            results = []
+            failed = False
+            for i, cmd in enumerate(commands):
+                if errors[i]:
+                    results.append({"status": "error", "command": cmd, "error": errors[i]})
+                    continue
+                if failed:
+                    results.append({
+                        "status": "error",
                         "device": device_name,
-                        "command": command,
-                        "parsed_output": parsed,
-                        "raw_output": cleaned,
-                        "parser_used": parser_cls.__name__,
-                    }
+                        "command": cmd,
+                        "error": "Not run: the device session failed on an earlier command.",
+                    })
+                    continue
+                try:
+                    raw = device.execute(cmd, timeout=60)
                 except Exception as e:
-                    logger.warning(f"Parser failed: {e}")
+                    logger.error(f"Error running show command '{cmd}': {e}", exc_info=True)
+                    results.append({"status": "error", "device": device_name, "command": cmd, "error": str(e)})
+                    failed = True
+                    continue
+                results.append(_parse_show_output(device, device_name, cmd, clean_output(raw)))
 
-            return {
-                "status": "completed",
-                "device": device_name,
-                "command": command,
-                "raw_output": cleaned,
-                "parser_used": None,
-            }
+            if failed:
+                # Drop the session: it may be mid-command
+                _disconnect_device(device, force=True)
+                device = None
+            return {"status": "completed", "device": device_name, "results": results}
 
         except Exception as e:
-            logger.error(f"Error running show command: {e}", exc_info=True)
-            return {"status": "error", "device": device_name, "command": command, "error": str(e)}
+            logger.error(f"Error running show commands: {e}", exc_info=True)
+            # Drop the session: it may be mid-command
+            _disconnect_device(device, force=True)
+            device = None
+            return {"status": "error", "device": device_name, "error": str(e)}
         finally:
             _disconnect_device(device)
 
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, _run)
+    return await _run_on_device(device_name, _run)
 
 
 async def apply_device_configuration_async(device_name: str, config_commands: Any) -> Dict[str, Any]:
@@ -361,6 +774,9 @@ async def apply_device_configuration_async(device_name: str, config_commands: An
 
         except Exception as e:
             logger.error(f"Error applying config: {e}", exc_info=True)
+            # Drop the session: it may be mid-command or left in config mode
+            _disconnect_device(device, force=True)
+            device = None
             return {
                 "status": "error",
                 "device": device_name,
@@ -370,8 +786,7 @@ async def apply_device_configuration_async(device_name: str, config_commands: An
         finally:
             _disconnect_device(device)
 
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, _apply)
+    return await _run_on_device(device_name, _apply)
 
 
 async def execute_learn_config_async(device_name: str) -> Dict[str, Any]:
@@ -399,12 +814,14 @@ async def execute_learn_config_async(device_name: str) -> Dict[str, Any]:
 
         except Exception as e:
             logger.error(f"Error learning config: {e}", exc_info=True)
+            # Drop the session: it may be mid-command
+            _disconnect_device(device, force=True)
+            device = None
             return {"status": "error", "device": device_name, "error": str(e)}
         finally:
             _disconnect_device(device)
 
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, _learn)
+    return await _run_on_device(device_name, _learn)
 
 
 async def execute_learn_logging_async(device_name: str) -> Dict[str, Any]:
@@ -432,12 +849,14 @@ async def execute_learn_logging_async(device_name: str) -> Dict[str, Any]:
 
         except Exception as e:
             logger.error(f"Error learning logging: {e}", exc_info=True)
+            # Drop the session: it may be mid-command
+            _disconnect_device(device, force=True)
+            device = None
             return {"status": "error", "device": device_name, "error": str(e)}
         finally:
             _disconnect_device(device)
 
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, _learn)
+    return await _run_on_device(device_name, _learn)
 
 
 async def run_ping_command_async(device_name: str, command: str) -> Dict[str, Any]:
@@ -458,7 +877,7 @@ async def run_ping_command_async(device_name: str, command: str) -> Dict[str, An
             raw = device.execute(command, timeout=180)
             cleaned = clean_output(raw)
 
-            parser_cls = get_parser(command, device)
+            parser_cls = _get_parser_cached(command, device)
             if parser_cls:
                 try:
                     parser_obj = parser_cls(device=device)
@@ -484,12 +903,14 @@ async def run_ping_command_async(device_name: str, command: str) -> Dict[str, An
 
         except Exception as e:
             logger.error(f"Error running ping: {e}", exc_info=True)
+            # Drop the session: it may be mid-command
+            _disconnect_device(device, force=True)
+            device = None
             return {"status": "error", "device": device_name, "command": command, "error": str(e)}
         finally:
             _disconnect_device(device)
 
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, _ping)
+    return await _run_on_device(device_name, _ping)
 
 
 async def run_linux_command_async(device_name: str, command: str) -> Dict[str, Any]:
@@ -519,12 +940,14 @@ async def run_linux_command_async(device_name: str, command: str) -> Dict[str, A
 
         except Exception as e:
             logger.error(f"Error running Linux command: {e}", exc_info=True)
+            # Drop the session: it may be mid-command
+            _disconnect_device(device, force=True)
+            device = None
             return {"status": "error", "device": device_name, "command": command, "error": str(e)}
         finally:
             _disconnect_device(device)
 
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, _exec)
+    return await _run_on_device(device_name, _exec)
 
 
 # -----------------------------------------------------------------------------
@@ -544,6 +967,16 @@ BANNED_PATTERNS = [
 ]
 
 
+_BANNED_IMPORT_RE = re.compile(
+    r"(?:import|from)\s+(" + "|".join(map(re.escape, BANNED_IMPORTS)) + ")",
+    re.IGNORECASE,
+)
+_BANNED_PATTERNS_RE = re.compile(
+    "|".join(f"(?P<p{i}>{pat})" for i, pat in enumerate(BANNED_PATTERNS)),
+    re.IGNORECASE,
+)
+
+
 def reject_unsafe_script(script: str) -> Optional[str]:
     """
     Check test script for unsafe patterns.
@@ -554,29 +987,292 @@ def reject_unsafe_script(script: str) -> Optional[str]:
     Returns:
         Error message if unsafe, None if safe
     """
-    lower = script.lower()
-    for imp in BANNED_IMPORTS:
-        if f"import {imp}" in lower or f"from {imp}" in lower:
-            return f"Script contains banned import: {imp}"
+    m = _BANNED_IMPORT_RE.search(script)
+    if m:
+        return f"Script contains banned import: {m.group(1).lower()}"
 
-    for pat in BANNED_PATTERNS:
-        if re.search(pat, script, re.IGNORECASE):
-            return f"Script contains banned pattern: {pat}"
+    m = _BANNED_PATTERNS_RE.search(script)
+    if m:
+        return f"Script contains banned pattern: {BANNED_PATTERNS[int(m.lastgroup[1:])]}"
 
     return None
 
 
+# First line mentioning "overall" together with "passed" (preferred) or "failed"
+_OVERALL_RE = re.compile(r"^(?=.*overall)(?:(?=.*(passed))|(?=.*(failed)))", re.IGNORECASE | re.MULTILINE)
+
+
 def _extract_overall_result(stdout: str) -> str:
     """Extract overall test result from pyATS stdout."""
-    for line in stdout.splitlines():
-        line_lower = line.lower()
-        if "passed" in line_lower and "overall" in line_lower:
-            return "PASSED"
-        if "failed" in line_lower and "overall" in line_lower:
-            return "FAILED"
+    m = _OVERALL_RE.search(stdout)
+    if not m:
+        return "UNKNOWN"
+    return "PASSED" if m.group(1) else "FAILED"
+
+
+def _preload_pyats() -> None:
+    """Import the pyATS CLI and easypy in a job worker before it gets a job."""
+    import pyats.easypy  # noqa: F401
+    import pyats.cli.__main__  # noqa: F401
+
+
+def _pyats_job_worker(job_path: str, report_path: str, log_path: str) -> int:
+    """
+    Run 'pyats run job' inside a job worker process.
+
+    stdout/stderr are redirected at the file descriptor level so the output
+    of the easypy task processes forked from the worker is captured too.
+    The worker is discarded afterwards, so they are not restored.
+
+    Returns:
+        The pyATS exit code
+    """
+    from pyats.cli.__main__ import main as pyats_main
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+    with open(log_path, "wb") as log:
+        os.dup2(log.fileno(), 1)
+        os.dup2(log.fileno(), 2)
+    try:
+        sys.argv = ["pyats", "run", "job", job_path, "--json-job", report_path]
+        pyats_main()
+        return 0
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else int(e.code is not None)
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+
+def _job_worker_main(conn) -> None:
+    """
+    Job worker process: preload pyATS, report ready, then run a single job.
+
+    The worker leads its own session so a timed out job can be killed along
+    with its easypy task processes without touching other jobs.
+    """
+    if hasattr(os, "setsid"):
+        os.setsid()
+    try:
+        _preload_pyats()
+    except BaseException as e:
+        conn.send(("error", repr(e)))
+        return
+    conn.send(("ready", None))
+    try:
+        job = conn.recv()
+    except EOFError:
+        return
+    conn.send(_pyats_job_worker(*job))
+
+
+@dataclass
+class _JobWorker:
+    """A spawned job worker and the parent end of its pipe."""
+    process: Any
+    conn: Any
+
+
+class _JobPoolUnavailable(RuntimeError):
+    """A job worker failed to start; the job was not run."""
+
+
+def _kill_process_group(proc) -> None:
+    """Kill a process started in its own session and everything it forked."""
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    proc.kill()
+
+
+def _discard_spare_job_workers() -> None:
+    """Kill the job workers started ahead of time that have no job yet."""
+    with _JOB_POOL_LOCK:
+        spares = list(_JOB_SPARES)
+        _JOB_SPARES.clear()
+    for worker in spares:
+        _kill_process_group(worker.process)
+        worker.conn.close()
+        worker.process.join()
+
+
+def _stop_job_workers() -> None:
+    """Kill the spare and running job workers at interpreter exit."""
+    _discard_spare_job_workers()
+    for proc in multiprocessing.active_children():
+        if proc.name == "pyats-job":
+            _kill_process_group(proc)
+
+
+def _start_job_worker() -> _JobWorker:
+    """Spawn a job worker; it preloads pyATS in the background."""
+    global _JOB_ATEXIT_REGISTERED
+    # spawn, not fork: the server process holds threads and an event loop.
+    # Not a daemon either: easypy forks its task processes from the worker
+    ctx = multiprocessing.get_context("spawn")
+    parent_conn, child_conn = ctx.Pipe()
+    proc = ctx.Process(target=_job_worker_main, args=(child_conn,), name="pyats-job")
+    proc.start()
+    child_conn.close()
+    if not _JOB_ATEXIT_REGISTERED:
+        # Registered after the first start, hence after multiprocessing's own
+        # exit hook, so it runs first and that hook does not wait on idle spares
+        atexit.register(_stop_job_workers)
+        _JOB_ATEXIT_REGISTERED = True
+    return _JobWorker(proc, parent_conn)
+
+
+def _take_job_worker() -> _JobWorker:
+    """Take a spare job worker and start another one to replace it."""
+    with _JOB_POOL_LOCK:
+        worker = _JOB_SPARES.pop() if _JOB_SPARES else _start_job_worker()
+        if _INPROC_JOBS:
+            _JOB_SPARES.append(_start_job_worker())
+    return worker
+
+
+def _wait_job_worker_ready(worker: _JobWorker) -> None:
+    """Wait for a job worker to finish preloading pyATS."""
+    if not worker.conn.poll(_JOB_WORKER_START_TIMEOUT_S):
+        raise _JobPoolUnavailable(f"job worker not ready after {_JOB_WORKER_START_TIMEOUT_S}s")
+    try:
+        status, error = worker.conn.recv()
+    except EOFError:
+        raise _JobPoolUnavailable(f"job worker exited with code {worker.process.exitcode}") from None
+    if status != "ready":
+        raise _JobPoolUnavailable(f"job worker failed to preload pyATS: {error}")
+
+
+def _scan_job_log(log_path: Path) -> str:
+    """Stream a job log line by line and extract the overall result."""
+    with open(log_path, "r", encoding="utf-8", errors="replace") as log:
+        for line in log:
+            overall = _extract_overall_result(line)
+            if overall != "UNKNOWN":
+                return overall
     return "UNKNOWN"
 
 
+def _read_log_tail(log_path: Path) -> Tuple[str, bool]:
+    """Read the last _STDOUT_TAIL_BYTES of a job log; flag whether it was cut."""
+    with open(log_path, "rb") as log:
+        size = log.seek(0, os.SEEK_END)
+        log.seek(max(0, size - _STDOUT_TAIL_BYTES))
+        return log.read().decode("utf-8", errors="replace"), size > _STDOUT_TAIL_BYTES
+
+
+def _run_job_inproc(job_path: Path, report_path: Path, log_path: Path, timeout_s: int) -> Tuple[int, str]:
+    """Run a pyATS job in a preloaded, single-use job worker."""
+    with _JOB_SLOTS:
+        worker = _take_job_worker()
+        try:
+            _wait_job_worker_ready(worker)
+            worker.conn.send((str(job_path), str(report_path), str(log_path)))
+            # The timeout starts once the job is handed to a ready worker
+            if not worker.conn.poll(timeout_s):
+                raise subprocess.TimeoutExpired(cmd="pyats run job", timeout=timeout_s)
+            try:
+                returncode = worker.conn.recv()
+            except EOFError:
+                raise RuntimeError(f"pyATS job worker exited with code {worker.process.exitcode}") from None
+        except BaseException:
+            _kill_process_group(worker.process)
+            raise
+        finally:
+            worker.conn.close()
+            worker.process.join()
+    return returncode, _scan_job_log(log_path)
+
+
+def _run_job_subprocess(job_path: Path, report_path: Path, log_path: Path, timeout_s: int) -> Tuple[int, str]:
+    """
+    Run a pyATS job in a 'pyats run job' subprocess.
+
+    Output is streamed line by line into log_path and scanned for the
+    overall result as it arrives, so it is never held in memory.
+    """
+    pyats_exec = shutil.which("pyats") or "pyats"
+    cmd = [pyats_exec, "run", "job", str(job_path), "--json-job", str(report_path)]
+    overall = "UNKNOWN"
+    timed_out = threading.Event()
+
+    with open(log_path, "w", encoding="utf-8") as log, subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        errors="replace",
+        env={**os.environ, "PYATS_TESTBED_PATH": TESTBED_PATH},
+        # Own session: the easypy processes it forks keep stdout open, so
+        # the whole group is killed on timeout for the read loop to end
+        start_new_session=True,
+    ) as proc:
+        def _kill():
+            timed_out.set()
+            _kill_process_group(proc)
+
+        watchdog = threading.Timer(timeout_s, _kill)
+        watchdog.start()
+        try:
+            for line in proc.stdout:
+                log.write(line)
+                if overall == "UNKNOWN":
+                    overall = _extract_overall_result(line)
+            returncode = proc.wait()
+        finally:
+            watchdog.cancel()
+
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(cmd=cmd, timeout=timeout_s)
+    return returncode, overall
+
+
+def _run_job(job_path: Path, report_path: Path, log_path: Path, timeout_s: int) -> Tuple[int, str]:
+    """
+    Run a pyATS job, preferring the preloaded job workers.
+
+    The combined stdout/stderr of the job is written to log_path.
+
+    Returns:
+        Tuple of (returncode, overall_result)
+
+    Raises:
+        subprocess.TimeoutExpired: If the job exceeds timeout_s
+    """
+    global _INPROC_JOBS
+    if _INPROC_JOBS:
+        try:
+            return _run_job_inproc(job_path, report_path, log_path, timeout_s)
+        except _JobPoolUnavailable as e:
+            logger.warning(f"pyATS job workers unavailable ({e}); falling back to subprocess jobs")
+            _INPROC_JOBS = False
+            _discard_spare_job_workers()
+    return _run_job_subprocess(job_path, report_path, log_path, timeout_s)
+
+
+def _artifact_cleaner() -> None:
+    """Background worker removing the run directories queued for deletion."""
+    while True:
+        run_dir = _CLEANUP_QUEUE.get()
+        shutil.rmtree(run_dir, ignore_errors=True)
+        _CLEANUP_QUEUE.task_done()
+
+
+if not KEEP_ARTIFACTS and not _SYNC_CLEANUP:
+    threading.Thread(target=_artifact_cleaner, name="artifact-cleaner", daemon=True).start()
+
+
+def _discard_run_dir(run_dir: Path) -> None:
+    """Remove a run directory, in the background unless cleanup is synchronous."""
+    if _SYNC_CLEANUP:
+        shutil.rmtree(run_dir, ignore_errors=True)
+    else:
+        _CLEANUP_QUEUE.put(run_dir)
+
+
 def _run_test_script(test_script_content: str, timeout_s: int = 300) -> Dict[str, Any]:
     """
     Execute a pyATS test script synchronously.
@@ -589,33 +1285,26 @@ def _run_test_script(test_script_content: str, timeout_s: int = 300) -> Dict[str
         Dictionary with test execution results
     """
     run_dir = ARTIFACTS_DIR / f"test_{int(time.time() * 1000)}"
-    run_dir.mkdir(parents=True, exist_ok=True)
+    os.makedirs(run_dir, exist_ok=True)
 
     script_path = run_dir / "test_script.py"
     job_path = run_dir / "job.py"
     report_path = run_dir / "report.json"
+    log_path = run_dir / "stdout.log"
 
     try:
-        script_path.write_text(test_script_content, encoding="utf-8")
+        # Write pre-encoded bytes: no text-mode encoder or newline translation
+        script_path.write_bytes(test_script_content.encode("utf-8"))
 
         safe_script_path = str(script_path).replace("\\", "\\\\")
         job_content = f"""from pyats.easypy import run
 def main(runtime):
     run(testscript='{safe_script_path}', runtime=runtime)
 """
-        job_path.write_text(job_content, encoding="utf-8")
-
-        pyats_exec = shutil.which("pyats") or "pyats"
-        cmd = [pyats_exec, "run", "job", str(job_path), "--json-job", str(report_path)]
+        job_path.write_bytes(job_content.encode("utf-8"))
 
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                env={**os.environ, "PYATS_TESTBED_PATH": TESTBED_PATH},
-                timeout=timeout_s,
-            )
+            returncode, overall = _run_job(job_path, report_path, log_path, timeout_s)
         except subprocess.TimeoutExpired:
             return {
                 "status": "error",
@@ -624,32 +1313,32 @@ def main(runtime):
             }
 
         report_data = None
-        if report_path.exists():
+        if report_path.exists() and report_path.stat().st_size:
             try:
-                txt = report_path.read_text(encoding="utf-8")
-                report_data = json.loads(txt) if txt.strip() else None
+                report_data = orjson.loads(report_path.read_bytes())
             except Exception as e:
                 logger.warning(f"Failed to parse report JSON: {e}")
 
-        overall = _extract_overall_result(result.stdout)
+        stdout_tail, stdout_truncated = _read_log_tail(log_path)
 
         payload = {
             "status": "completed",
-            "returncode": result.returncode,
+            "returncode": returncode,
             "overall_result": overall,
-            "stdout": result.stdout,
-            "stderr": result.stderr,
+            "stdout": stdout_tail,
+            "stdout_truncated": stdout_truncated,
             "report": report_data,
             "artifacts_dir": str(run_dir),
             "paths": {
                 "script": str(script_path),
                 "job": str(job_path),
                 "report": str(report_path),
+                "stdout_log": str(log_path),
             },
         }
 
         if not KEEP_ARTIFACTS:
-            shutil.rmtree(run_dir, ignore_errors=True)
+            _discard_run_dir(run_dir)
 
         return payload
 